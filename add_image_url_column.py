@@ -3,40 +3,45 @@ Migration script to add image_url column to courses table
 """
 import os
 import sys
-from flask import Flask
 from sqlalchemy import text
 
 # Add the project directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import after adding to path
-from app import db, create_app
+from app import db
+from setup_common import get_app
 
-# Create app with the database configuration
-app = create_app()
+# Reuse the app shared across setup scripts
+app = get_app()
+
+# Statements are built once at import rather than on every run
+ADD_COLUMN_IF_MISSING = text("ALTER TABLE courses ADD COLUMN IF NOT EXISTS image_url VARCHAR(255) NULL")
+CHECK_COLUMN = text("SHOW COLUMNS FROM courses LIKE 'image_url'")
+ADD_COLUMN = text("ALTER TABLE courses ADD COLUMN image_url VARCHAR(255) NULL")
 
 def add_image_url_column():
     """Add image_url column to courses table"""
     with app.app_context():
         try:
-            # Connect using SQLAlchemy engine
-            connection = db.engine.connect()
-            
-            # Check if column already exists to avoid errors
-            check_query = text("SHOW COLUMNS FROM courses LIKE 'image_url'")
-            result = connection.execute(check_query)
-            column_exists = result.fetchone() is not None
-            
-            if not column_exists:
-                # Execute ALTER TABLE statement
-                alter_query = text("ALTER TABLE courses ADD COLUMN image_url VARCHAR(255) NULL")
-                connection.execute(alter_query)
-                connection.commit()
-                print("Successfully added image_url column to courses table")
-            else:
-                print("Column image_url already exists in courses table")
+            # Scope the connection to this block; the ALTER commits implicitly
+            with db.engine.begin() as connection:
+                if connection.dialect.is_mariadb:
+                    # MariaDB skips existing columns itself, so no separate lookup is needed
+                    connection.execute(ADD_COLUMN_IF_MISSING)
+                    print("Ensured image_url column exists in courses table")
+                else:
+                    # Check if column already exists to avoid errors
+                    result = connection.execute(CHECK_COLUMN)
+                    column_exists = result.fetchone() is not None
+                
+                    if not column_exists:
+                        # Execute ALTER TABLE statement
+                        connection.execute(ADD_COLUMN)
+                        print("Successfully added image_url column to courses table")
+                    else:
+                        print("Column image_url already exists in courses table")
                 
-            connection.close()
             return True
         except Exception as e:
             print(f"Error adding column: {str(e)}")
@@ -0,0 +1,59 @@
+"""
+Migration script to add the (user_id, completed_at) index to quiz_attempts table
+"""
+import os
+import sys
+from sqlalchemy import text
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import after adding to path
+from app import db
+from setup_common import get_app
+
+# Reuse the app shared across setup scripts
+app = get_app()
+
+# Statements are built once at import rather than on every run
+CHECK_INDEX = text("SHOW INDEX FROM quiz_attempts WHERE Key_name = 'idx_quiz_attempts_user_completed'")
+ADD_INDEX = text("ALTER TABLE quiz_attempts ADD INDEX idx_quiz_attempts_user_completed (user_id, completed_at)")
+LIST_INDEXES = text("SHOW INDEX FROM quiz_attempts")
+
+def add_quiz_attempt_index():
+    """Add a composite index so per-user attempt history is read in completed_at order,
+    replacing the single-column user_id index"""
+    with app.app_context():
+        try:
+            # Scope the connection to this block; each ALTER commits implicitly,
+            # so every step checks for existing state before acting
+            with db.engine.begin() as connection:
+                # Check if index already exists to avoid errors
+                result = connection.execute(CHECK_INDEX)
+                index_exists = result.fetchone() is not None
+
+                if not index_exists:
+                    connection.execute(ADD_INDEX)
+                    print("Successfully added idx_quiz_attempts_user_completed to quiz_attempts table")
+                else:
+                    print("Index idx_quiz_attempts_user_completed already exists on quiz_attempts table")
+
+                # The composite index's leftmost column covers user_id lookups and
+                # the foreign key, so the old single-column index (user_id from
+                # schema.sql, ix_quiz_attempts_user_id from create_all) is redundant
+                index_columns = {}
+                for row in connection.execute(LIST_INDEXES).mappings():
+                    index_columns.setdefault(row['Key_name'], []).append(row['Column_name'])
+
+                for key_name, columns in index_columns.items():
+                    if key_name != 'PRIMARY' and columns == ['user_id']:
+                        connection.execute(text(f"ALTER TABLE quiz_attempts DROP INDEX `{key_name}`"))
+                        print(f"Dropped redundant index {key_name} from quiz_attempts table")
+
+            return True
+        except Exception as e:
+            print(f"Error adding index: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    add_quiz_attempt_index()
@@ -0,0 +1,66 @@
+"""
+Migration script to give created_at/updated_at columns a CURRENT_TIMESTAMP default
+"""
+import os
+import sys
+from sqlalchemy import text
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import after adding to path
+from app import db
+from setup_common import get_app
+
+# Reuse the app shared across setup scripts
+app = get_app()
+
+# Tables created by create_all before the models switched to server defaults
+# have these columns as plain DATETIME with no default, so inserts leave them NULL
+TIMESTAMP_COLUMNS = {
+    table.name: [column for column in ('created_at', 'updated_at') if column in table.c]
+    for table in db.metadata.sorted_tables
+    if 'created_at' in table.c or 'updated_at' in table.c
+}
+
+def add_timestamp_defaults():
+    """Add missing CURRENT_TIMESTAMP defaults and backfill rows inserted without one"""
+    with app.app_context():
+        try:
+            # engine.begin() keeps every statement on one connection and releases
+            # it on exit; MariaDB commits each ALTER implicitly, so every step
+            # below is written to be safe to rerun instead of relying on rollback
+            with db.engine.begin() as connection:
+                for table, columns in TIMESTAMP_COLUMNS.items():
+                    modifications = []
+                    for column in columns:
+                        check_query = text(f"SHOW COLUMNS FROM {table} LIKE '{column}'")
+                        row = connection.execute(check_query).mappings().fetchone()
+                        
+                        if row is None:
+                            print(f"Error: column {table}.{column} does not exist")
+                            return False
+                        if row['Default'] is None:
+                            modifications.append(
+                                f"MODIFY COLUMN {column} {row['Type']} NULL DEFAULT CURRENT_TIMESTAMP"
+                            )
+                    
+                    if modifications:
+                        # One ALTER per table so each table is rebuilt at most once
+                        connection.execute(text(f"ALTER TABLE {table} {', '.join(modifications)}"))
+                        print(f"Successfully added timestamp defaults to {table} table")
+                    else:
+                        print(f"Timestamp defaults already present on {table} table")
+                    
+                    for column in columns:
+                        connection.execute(text(
+                            f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP WHERE {column} IS NULL"
+                        ))
+            
+            return True
+        except Exception as e:
+            print(f"Error adding timestamp defaults: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    add_timestamp_defaults()
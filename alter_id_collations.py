@@ -0,0 +1,59 @@
+"""
+Migration script to switch opaque identifier columns to the ascii_bin collation
+"""
+import os
+import sys
+from sqlalchemy import text
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import after adding to path
+from app import db
+from setup_common import get_app
+
+# Reuse the app shared across setup scripts
+app = get_app()
+
+# (table, column, column definition) for every opaque ASCII identifier
+ID_COLUMNS = [
+    ('certificates', 'certificate_id', 'VARCHAR(50) CHARACTER SET ascii COLLATE ascii_bin NOT NULL'),
+    ('payments', 'stripe_payment_id', 'VARCHAR(100) CHARACTER SET ascii COLLATE ascii_bin NOT NULL'),
+]
+
+# (table, column, check statement, alter statement) built once at import
+ID_COLUMN_STATEMENTS = [
+    (table, column,
+     text(f"SHOW FULL COLUMNS FROM {table} LIKE '{column}'"),
+     text(f"ALTER TABLE {table} MODIFY COLUMN {column} {definition}"))
+    for table, column, definition in ID_COLUMNS
+]
+
+def alter_id_collations():
+    """Convert identifier columns to ascii_bin so lookups skip Unicode collation"""
+    with app.app_context():
+        try:
+            # Scope the connection to this block. Each MODIFY commits implicitly, so a
+            # failure part-way leaves earlier columns converted and a rerun skips them
+            missing_columns = False
+            with db.engine.begin() as connection:
+                for table, column, check_query, alter_query in ID_COLUMN_STATEMENTS:
+                    # Check the current collation to avoid rebuilding the table needlessly
+                    row = connection.execute(check_query).mappings().fetchone()
+
+                    if row is None:
+                        print(f"Error: column {table}.{column} does not exist")
+                        missing_columns = True
+                    elif row['Collation'] != 'ascii_bin':
+                        connection.execute(alter_query)
+                        print(f"Successfully converted {table}.{column} to ascii_bin")
+                    else:
+                        print(f"Column {table}.{column} already uses ascii_bin")
+
+            return not missing_columns
+        except Exception as e:
+            print(f"Error altering columns: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    alter_id_collations()
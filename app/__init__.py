@@ -10,13 +10,20 @@ The app is a full-stack learning platform built with Flask. It supports:
 - Config loading from instance folder or .env
 """
 
+import os
 from flask import Flask
 from .extensions import db, login_manager, mail, migrate, csrf
-from config import Config
+from config import Config, config
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
+    # Pick the configuration named by FLASK_CONFIG (e.g. "production"),
+    # falling back to the base Config when it is unset
+    if config_class is None:
+        config_class = config.get(os.environ.get('FLASK_CONFIG'), Config)
+    
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(config_class)
+    config_class.init_app(app)
 
     # Initialize extensions
     db.init_app(app)
@@ -9,6 +9,7 @@ from app.blueprints.admin import admin
 from app import db
 from app.extensions import allowed_file
 from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 
 @admin.before_request
 def check_admin():
@@ -51,7 +52,9 @@ def index():
     
     # Get recent enrollments and users for dashboard tables
     try:
-        recent_enrollments = UserCourse.query.order_by(UserCourse.enrollment_date.desc()).limit(5).all()
+        recent_enrollments = UserCourse.query.options(
+            joinedload(UserCourse.user), joinedload(UserCourse.course)
+        ).order_by(UserCourse.enrollment_date.desc()).limit(5).all()
     except Exception:
         recent_enrollments = []
     
@@ -170,7 +173,7 @@ def ensure_upload_folder(folder_name):
         try:
             os.makedirs(upload_path)
         except Exception as e:
-            current_app.logger.error(f"Failed to create directory {upload_path}: {str(e)}")
+            current_app.logger.error("Failed to create directory %s: %s", upload_path, e)
             return None
     return upload_path
 
@@ -218,7 +221,7 @@ def new_video(course_id):
             video_path = os.path.join('uploads', VIDEO_UPLOAD_FOLDER, filename).replace('\\', '/') 
         except Exception as e:
             flash(f'Failed to save video file: {str(e)}', 'danger')
-            current_app.logger.error(f"Video upload failed: {str(e)}")
+            current_app.logger.error("Video upload failed: %s", e)
             return render_template('admin/videos/form.html', course=course, video=None)
 
         # Create a new video
@@ -282,7 +285,7 @@ def edit_video(video_id):
                 video.video_path = os.path.join('uploads', VIDEO_UPLOAD_FOLDER, filename).replace('\\', '/')
             except Exception as e:
                 flash(f'Failed to replace video file: {str(e)}', 'danger')
-                current_app.logger.error(f"Video replacement failed: {str(e)}")
+                current_app.logger.error("Video replacement failed: %s", e)
                 return render_template('admin/videos/form.html', course=course, video=video)
 
         db.session.commit()
@@ -307,7 +310,7 @@ def delete_video(video_id):
             os.remove(file_path)
     except Exception as e:
         flash(f'Could not delete video file: {str(e)}', 'warning')
-        current_app.logger.error(f"Failed to delete video file {video.video_path}: {str(e)}")
+        current_app.logger.error("Failed to delete video file %s: %s", video.video_path, e)
 
     db.session.delete(video)
     db.session.commit()
@@ -343,7 +346,7 @@ def reorder_videos(course_id):
         return jsonify({'success': True})
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"Error reordering videos: {str(e)}")
+        current_app.logger.error("Error reordering videos: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # PDF Management Routes
@@ -441,6 +444,16 @@ def delete_pdf(pdf_id):
     return redirect(url_for('admin.pdfs', course_id=course_id))
 
 # Quiz Management Routes
+def insert_answers(question_id, answers, correct_answer_index):
+    """Insert a question's non-blank answers in one executemany, marking the correct one"""
+    rows = [
+        {'question_id': question_id, 'answer_text': answer_text, 'is_correct': i == correct_answer_index}
+        for i, answer_text in enumerate(answers)
+        if answer_text.strip()
+    ]
+    if rows:
+        db.session.execute(QuizAnswer.__table__.insert(), rows)
+
 @admin.route('/courses/<int:course_id>/quizzes')
 @login_required
 def quizzes(course_id):
@@ -524,6 +537,22 @@ def new_question(quiz_id):
         question_type = 'single_choice'  # Force single choice type
         points = int(request.form.get('points', 1))
         
+        # Process exactly 4 answers
+        answers = request.form.getlist('answer_text[]')
+        correct_answer_index = request.form.get('is_correct')
+        
+        # Validate before writing anything so a bad form never touches the database
+        if len(answers) != 4:
+            flash('Exactly 4 answers are required.', 'danger')
+            return redirect(url_for('admin.new_question', quiz_id=quiz_id))
+            
+        if correct_answer_index is None:
+            flash('You must select a correct answer.', 'danger')
+            return redirect(url_for('admin.new_question', quiz_id=quiz_id))
+        
+        # Convert to integer
+        correct_answer_index = int(correct_answer_index)
+        
         # Get the max sequence_order or default to 0
         max_sequence = db.session.query(func.max(QuizQuestion.sequence_order))\
                         .filter(QuizQuestion.quiz_id == quiz_id).scalar() or 0
@@ -538,40 +567,21 @@ def new_question(quiz_id):
             sequence_order=sequence_order
         )
         
-        db.session.add(question)
-        db.session.commit()
-        
-        # Process exactly 4 answers
-        answers = request.form.getlist('answer_text[]')
-        correct_answer_index = request.form.get('is_correct')
-        
-        if len(answers) != 4:
-            flash('Exactly 4 answers are required.', 'danger')
-            db.session.delete(question)
-            db.session.commit()
-            return redirect(url_for('admin.new_question', quiz_id=quiz_id))
+        try:
+            # Flush for the question id, then commit question and answers together
+            db.session.add(question)
+            db.session.flush()
+            
+            # Add all 4 answers, marking the correct one
+            insert_answers(question.id, answers, correct_answer_index)
             
-        if correct_answer_index is None:
-            flash('You must select a correct answer.', 'danger')
-            db.session.delete(question)
             db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error("Failed to add question: %s", e)
+            flash('Failed to add question. Please try again.', 'danger')
             return redirect(url_for('admin.new_question', quiz_id=quiz_id))
         
-        # Convert to integer
-        correct_answer_index = int(correct_answer_index)
-        
-        # Add all 4 answers, marking the correct one
-        for i, answer_text in enumerate(answers):
-            if answer_text.strip():
-                is_correct = (i == correct_answer_index)
-                answer = QuizAnswer(
-                    question_id=question.id,
-                    answer_text=answer_text,
-                    is_correct=is_correct
-                )
-                db.session.add(answer)
-        
-        db.session.commit()
         flash('Question added successfully!', 'success')
         return redirect(url_for('admin.edit_quiz', quiz_id=quiz_id))
     
@@ -608,15 +618,7 @@ def edit_question(question_id):
         QuizAnswer.query.filter_by(question_id=question_id).delete()
         
         # Add all 4 answers, marking the correct one
-        for i, answer_text in enumerate(answers):
-            if answer_text.strip():
-                is_correct = (i == correct_answer_index)
-                answer = QuizAnswer(
-                    question_id=question.id,
-                    answer_text=answer_text,
-                    is_correct=is_correct
-                )
-                db.session.add(answer)
+        insert_answers(question.id, answers, correct_answer_index)
         
         db.session.commit()
         flash('Question updated successfully!', 'success')
@@ -690,7 +692,10 @@ def enrollments():
     """List all course enrollments"""
     from app.models import UserCourse
     
-    enrollments = UserCourse.query.all()
+    # Load each enrollment's user and course in the same query
+    enrollments = UserCourse.query.options(
+        joinedload(UserCourse.user), joinedload(UserCourse.course)
+    ).all()
     return render_template('admin/enrollments/index.html', enrollments=enrollments)
 
 # Revenue Management Route
@@ -716,10 +721,12 @@ def revenue():
          .all()
         
         # Recent payments 
-        recent_payments = Payment.query.order_by(Payment.payment_date.desc()).limit(10).all()
+        recent_payments = Payment.query.options(
+            joinedload(Payment.user), joinedload(Payment.course)
+        ).order_by(Payment.payment_date.desc()).limit(10).all()
         
     except Exception as e:
-        current_app.logger.error(f"Error calculating revenue: {str(e)}")
+        current_app.logger.error("Error calculating revenue: %s", e)
         total_revenue = 0
         course_revenue = []
         recent_payments = []
@@ -737,11 +744,7 @@ def settings():
     from app.models import PlatformConfig
     
     # Get or create platform config
-    config = PlatformConfig.query.first()
-    if not config:
-        config = PlatformConfig()
-        db.session.add(config)
-        db.session.commit()
+    config = PlatformConfig.get_config(for_update=True)
     
     if request.method == 'POST':
         config.platform_name = request.form.get('platform_name')
@@ -762,7 +765,7 @@ def settings():
                 config.logo_path = os.path.join('uploads', 'logos', filename)
             except Exception as e:
                 flash(f'Failed to upload logo: {str(e)}', 'danger')
-                current_app.logger.error(f'Logo upload failed: {str(e)}')
+                current_app.logger.error('Logo upload failed: %s', e)
         
         # Stripe settings
         config.stripe_secret_key = request.form.get('stripe_secret_key')
@@ -775,6 +778,6 @@ def settings():
         except Exception as e:
             db.session.rollback()
             flash(f'Failed to save settings: {str(e)}', 'danger')
-            current_app.logger.error(f'Failed to save platform config: {str(e)}')
+            current_app.logger.error('Failed to save platform config: %s', e)
     
     return render_template('admin/settings/index.html', config=config)
\ No newline at end of file
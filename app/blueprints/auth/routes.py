@@ -3,6 +3,7 @@ Auth blueprint routes
 """
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, current_user, login_required
+from sqlalchemy.orm import selectinload
 from app import db
 from app.models import User
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -26,7 +27,8 @@ def login():
             flash('Please enter email and password.', 'danger')
             return redirect(url_for('auth.login'))
         
-        user = User.query.filter_by(email=email).first()
+        # Credentials are only loaded here, never by load_user
+        user = User.query.options(selectinload(User.credential)).filter_by(email=email).first()
         
         if user and user.check_password(password):
             login_user(user, remember=remember)
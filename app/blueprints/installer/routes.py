@@ -4,21 +4,26 @@ Installer blueprint routes for the setup wizard
 from flask import Blueprint, render_template, redirect, url_for, flash, current_app, request
 from flask_login import login_required, current_user, login_user
 from werkzeug.utils import secure_filename
+from sqlalchemy import text
 from app import db
 from app.models import User, PlatformConfig
+from app.extensions import path_exists_cached
 import os
 import uuid
 
 bp = Blueprint('installer', __name__, url_prefix='/installer')
 
+# Connectivity probe, built once and reused by every visit to the wizard
+PING_QUERY = text('SELECT 1')
+
 def is_setup_complete():
     """Check if the setup is already completed"""
     # Check if setup flag file exists
-    if os.path.exists(current_app.config['SETUP_FLAG_FILE']):
+    if path_exists_cached(current_app.config['SETUP_FLAG_FILE']):
         return True
     
-    # Check if setup is marked as complete in database
-    platform_config = PlatformConfig.query.first()
+    # Check if setup is marked as complete in database, without creating a row
+    platform_config = PlatformConfig.get_config(create=False)
     if platform_config and platform_config.setup_complete:
         return True
     
@@ -30,14 +35,11 @@ def mark_setup_complete():
     with open(current_app.config['SETUP_FLAG_FILE'], 'w') as f:
         f.write('setup_complete')
     
-    # Set setup_complete in the database
-    platform_config = PlatformConfig.query.first()
-    if not platform_config:
-        platform_config = PlatformConfig()
-        db.session.add(platform_config)
-    
-    platform_config.setup_complete = True
-    db.session.commit()
+    # Set setup_complete in the database, skipping the write if already set
+    platform_config = PlatformConfig.get_config(for_update=True)
+    if not platform_config.setup_complete:
+        platform_config.setup_complete = True
+        db.session.commit()
 
 @bp.before_request
 def check_setup():
@@ -61,7 +63,7 @@ def index():
     # Check if database connection works
     db_connected = True
     try:
-        db.session.execute('SELECT 1')
+        db.session.execute(PING_QUERY)
     except Exception:
         db_connected = False
     
@@ -136,11 +138,7 @@ def create_admin():
 def platform_config():
     """Configure platform settings"""
     # Get or create platform config
-    config = PlatformConfig.query.first()
-    if not config:
-        config = PlatformConfig()
-        db.session.add(config)
-        db.session.commit()
+    config = PlatformConfig.get_config(for_update=True)
     
     # Ensure upload directories exist
     upload_dirs = [
@@ -155,7 +153,7 @@ def platform_config():
                 os.makedirs(directory)
         except Exception as e:
             flash(f'Failed to create upload directory: {str(e)}', 'danger')
-            current_app.logger.error(f'Failed to create directory {directory}: {str(e)}')
+            current_app.logger.error('Failed to create directory %s: %s', directory, e)
     
     if request.method == 'POST':
         config.platform_name = request.form.get('platform_name')
@@ -174,7 +172,7 @@ def platform_config():
                 config.logo_path = os.path.join('uploads', 'logos', filename)
             except Exception as e:
                 flash(f'Failed to upload logo: {str(e)}', 'danger')
-                current_app.logger.error(f'Logo upload failed: {str(e)}')
+                current_app.logger.error('Logo upload failed: %s', e)
         
         try:
             db.session.commit()
@@ -183,7 +181,7 @@ def platform_config():
         except Exception as e:
             db.session.rollback()
             flash(f'Failed to save configuration: {str(e)}', 'danger')
-            current_app.logger.error(f'Failed to save platform config: {str(e)}')
+            current_app.logger.error('Failed to save platform config: %s', e)
     
     return render_template('installer/platform_config.html', config=config)
 
@@ -191,11 +189,7 @@ def platform_config():
 def stripe_config():
     """Configure Stripe integration"""
     # Get or create platform config
-    config = PlatformConfig.query.first()
-    if not config:
-        config = PlatformConfig()
-        db.session.add(config)
-        db.session.commit()
+    config = PlatformConfig.get_config(for_update=True)
     
     if request.method == 'POST':
         config.stripe_secret_key = request.form.get('stripe_secret_key')
@@ -3,25 +3,25 @@ Main blueprint routes
 """
 from flask import Blueprint, render_template, redirect, url_for, current_app
 from flask_login import current_user, login_required
-import os
 from app.models import PlatformConfig
+from app.extensions import path_exists_cached
 
 bp = Blueprint('main', __name__)
 
 def is_setup_complete():
     """Check if the setup is already completed"""
     # Check if setup flag file exists
-    if os.path.exists(current_app.config['SETUP_FLAG_FILE']):
+    if path_exists_cached(current_app.config['SETUP_FLAG_FILE']):
         return True
     
     # Check if setup is marked as complete in database
     try:
-        platform_config = PlatformConfig.query.first()
+        platform_config = PlatformConfig.get_config(create=False)
         if platform_config and platform_config.setup_complete:
             return True
     except Exception as e:
         # If there's an error (like missing table), return False to trigger setup
-        current_app.logger.error(f"Database error in is_setup_complete: {str(e)}")
+        current_app.logger.error("Database error in is_setup_complete: %s", e)
         return False
     
     return False
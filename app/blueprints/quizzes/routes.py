@@ -1,12 +1,13 @@
 """
 Quizzes blueprint routes
 """
-from flask import Blueprint, render_template, redirect, url_for, request, jsonify, flash
+from flask import Blueprint, render_template, redirect, url_for, request, jsonify, flash, abort
 from flask_login import login_required, current_user
-from app.models import Quiz, QuizQuestion, QuizAnswer, QuizAttempt, Course, UserCourse
+from app.models import Quiz, QuizQuestion, QuizAttempt, UserCourse
 from app import db
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, and_
+from sqlalchemy.orm import joinedload, selectinload
 
 bp = Blueprint('quizzes', __name__, url_prefix='/quizzes')
 
@@ -16,22 +17,27 @@ def take_quiz(quiz_id):
     """
     Take a quiz
     """
-    # Get the quiz
-    quiz = Quiz.query.get_or_404(quiz_id)
-    course = Course.query.get_or_404(quiz.course_id)
+    # Get the quiz, its course and the user's enrollment in one round trip,
+    # then the questions and answers in one query per level
+    row = db.session.query(Quiz, UserCourse.id).options(
+        joinedload(Quiz.course),
+        selectinload(Quiz.questions).selectinload(QuizQuestion.answers)
+    ).outerjoin(
+        UserCourse, and_(UserCourse.course_id == Quiz.course_id, UserCourse.user_id == current_user.id)
+    ).filter(Quiz.id == quiz_id).first()
+    if row is None:
+        abort(404)
+    quiz, enrollment_id = row
+    course = quiz.course
     
     # Check if user is enrolled in the course
-    enrollment = UserCourse.query.filter_by(user_id=current_user.id, course_id=course.id).first()
-    if not enrollment:
+    if enrollment_id is None:
         flash('You must be enrolled in this course to take the quiz.', 'danger')
         return redirect(url_for('courses.view', course_id=course.id))
     
-    # Get all questions for the quiz
-    questions = QuizQuestion.query.filter_by(quiz_id=quiz_id).order_by(QuizQuestion.sequence_order).all()
+    questions = quiz.questions
     
-    # For each question, load its 4 answers
     for question in questions:
-        question.answers = QuizAnswer.query.filter_by(question_id=question.id).all()
         # Make sure we have exactly 4 answers
         if len(question.answers) != 4:
             flash(f"Question {question.id} doesn't have exactly 4 answers. Please contact an administrator.", "danger")
@@ -45,11 +51,11 @@ def submit_quiz(quiz_id):
     """
     Submit a quiz for grading
     """
-    # Get the quiz
-    quiz = Quiz.query.get_or_404(quiz_id)
-    
-    # Get all questions for the quiz
-    questions = QuizQuestion.query.filter_by(quiz_id=quiz_id).all()
+    # Get the quiz with its questions and answers in one query per level
+    quiz = Quiz.query.options(
+        selectinload(Quiz.questions).selectinload(QuizQuestion.answers)
+    ).get_or_404(quiz_id)
+    questions = quiz.questions
     
     # Calculate score
     total_points = sum(q.points for q in questions)
@@ -66,11 +72,8 @@ def submit_quiz(quiz_id):
         # Convert to integer
         selected_answer_index = int(selected_answer_index)
         
-        # Get all answers for this question
-        answers = QuizAnswer.query.filter_by(question_id=question.id).all()
-        
         # Find the correct answer
-        for i, answer in enumerate(answers):
+        for i, answer in enumerate(question.answers):
             if answer.is_correct and i == selected_answer_index:
                 earned_points += question.points
                 break
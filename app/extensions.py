@@ -9,6 +9,7 @@ This file initializes all Flask extensions used across the application:
 - Flask-WTF for form handling and CSRF protection
 """
 
+import os
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_mail import Mail
@@ -46,6 +47,27 @@ def allowed_file(filename, allowed_extensions):
     """
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
+# Paths already seen to exist; a missing path is never cached so it is
+# picked up the moment it is created
+_existing_paths = set()
+
+def path_exists_cached(path):
+    """
+    Check whether a path exists, remembering only positive answers
+    
+    Args:
+        path (str): The filesystem path to check
+    
+    Returns:
+        bool: True if the path exists or has existed before, False otherwise
+    """
+    if path in _existing_paths:
+        return True
+    if os.path.exists(path):
+        _existing_paths.add(path)
+        return True
+    return False
+
 # Import models to ensure they're registered with SQLAlchemy
 # This import is at the bottom to avoid circular imports
 # from app import models
\ No newline at end of file
@@ -1,11 +1,21 @@
 """
 SQLAlchemy ORM models for the Modular Course Platform
 """
+import time
 from datetime import datetime
+from flask import current_app, g, has_request_context
 from flask_login import UserMixin
+from sqlalchemy import event, func
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db, login_manager
 
+def ascii_id(length):
+    """String type for opaque ASCII identifiers; binary ascii collation on MariaDB/MySQL"""
+    return db.String(length).with_variant(
+        mysql.VARCHAR(length, charset='ascii', collation='ascii_bin'), 'mysql')
+
 class User(UserMixin, db.Model):
     """User model for authentication and user management"""
     __tablename__ = 'users'
@@ -13,10 +23,9 @@ class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), nullable=False, unique=True, index=True)
-    password_hash = db.Column(db.String(255), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     enrolled_courses = db.relationship('UserCourse', back_populates='user', lazy='dynamic')
@@ -24,12 +33,33 @@ class User(UserMixin, db.Model):
     video_progress = db.relationship('VideoProgress', back_populates='user', lazy='dynamic')
     certificates = db.relationship('Certificate', back_populates='user', lazy='dynamic')
     payments = db.relationship('Payment', back_populates='user', lazy='dynamic')
+    # Credentials live in their own table so load_user never reads them;
+    # callers that need them must eager-load with selectinload(User.credential)
+    credential = db.relationship('UserCredential', back_populates='user', uselist=False,
+                                 lazy='raise', cascade='all, delete-orphan', passive_deletes=True)
+    
+    def _get_credential(self):
+        """Return the credential row, fetching it by primary key if it was not eager-loaded"""
+        state = db.inspect(self)
+        if state.persistent and 'credential' in state.unloaded:
+            return UserCredential.query.get(self.id)
+        return self.credential
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        password_hash = generate_password_hash(password)
+        credential = self._get_credential()
+        if credential is not None:
+            credential.password_hash = password_hash
+        elif db.inspect(self).persistent:
+            db.session.add(UserCredential(user_id=self.id, password_hash=password_hash))
+        else:
+            self.credential = UserCredential(password_hash=password_hash)
         
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        credential = self._get_credential()
+        if credential is None:
+            return False
+        return check_password_hash(credential.password_hash, password)
     
     def __repr__(self):
         return f'<User {self.email}>'
@@ -38,6 +68,21 @@ class User(UserMixin, db.Model):
 def load_user(id):
     return User.query.get(int(id))
 
+class UserCredential(db.Model):
+    """Password credentials for a user, split out of the users table"""
+    __tablename__ = 'user_credentials'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    password_hash = db.Column(db.String(255), nullable=False)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
+    
+    # Relationships
+    user = db.relationship('User', back_populates='credential')
+    
+    def __repr__(self):
+        return f'<UserCredential {self.user_id}>'
+
 class Course(db.Model):
     """Course model for course management"""
     __tablename__ = 'courses'
@@ -49,8 +94,8 @@ class Course(db.Model):
     is_active = db.Column(db.Boolean, default=True, index=True)
     has_certificate = db.Column(db.Boolean, default=False)
     image_url = db.Column(db.String(255), nullable=True)  # Added image_url field
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     videos = db.relationship('Video', back_populates='course', lazy='dynamic', cascade='all, delete-orphan')
@@ -76,8 +121,8 @@ class Video(db.Model):
     sequence_order = db.Column(db.Integer, nullable=False)
     duration_seconds = db.Column(db.Integer, default=0) # Changed from duration
     is_free = db.Column(db.Boolean, default=False) # Added is_free field
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     course = db.relationship('Course', back_populates='videos')
@@ -99,12 +144,14 @@ class Quiz(db.Model):
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
     passing_percentage = db.Column(db.Integer, default=70)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     course = db.relationship('Course', back_populates='quiz')
-    questions = db.relationship('QuizQuestion', back_populates='quiz', lazy='dynamic', cascade='all, delete-orphan')
+    # Plain select loading so callers can eager-load with selectinload()
+    questions = db.relationship('QuizQuestion', back_populates='quiz', order_by='QuizQuestion.sequence_order',
+                                cascade='all, delete-orphan')
     attempts = db.relationship('QuizAttempt', back_populates='quiz', lazy='dynamic')
     
     def __repr__(self):
@@ -120,12 +167,13 @@ class QuizQuestion(db.Model):
     question_type = db.Column(db.String(20), default='multiple_choice')
     points = db.Column(db.Integer, default=1)
     sequence_order = db.Column(db.Integer, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     quiz = db.relationship('Quiz', back_populates='questions')
-    answers = db.relationship('QuizAnswer', back_populates='question', lazy='dynamic', cascade='all, delete-orphan')
+    answers = db.relationship('QuizAnswer', back_populates='question', order_by='QuizAnswer.id',
+                              cascade='all, delete-orphan')
     
     __table_args__ = (
         db.UniqueConstraint('quiz_id', 'sequence_order', name='_quiz_sequence_uc'),
@@ -142,8 +190,8 @@ class QuizAnswer(db.Model):
     question_id = db.Column(db.Integer, db.ForeignKey('quiz_questions.id', ondelete='CASCADE'), nullable=False, index=True)
     answer_text = db.Column(db.Text, nullable=False)
     is_correct = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     question = db.relationship('QuizQuestion', back_populates='answers')
@@ -156,18 +204,23 @@ class QuizAttempt(db.Model):
     __tablename__ = 'quiz_attempts'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id', ondelete='CASCADE'), nullable=False, index=True)
     score = db.Column(db.Integer, nullable=False)
     passed = db.Column(db.Boolean, nullable=False)
     completed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     user = db.relationship('User', back_populates='quiz_attempts')
     quiz = db.relationship('Quiz', back_populates='attempts')
     
+    __table_args__ = (
+        # Serves "my attempts, newest first" without a filesort and covers the user_id FK
+        db.Index('idx_quiz_attempts_user_completed', 'user_id', 'completed_at'),
+    )
+    
     def __repr__(self):
         return f'<QuizAttempt {self.id} - User: {self.user_id}, Quiz: {self.quiz_id}>'
 
@@ -178,11 +231,11 @@ class Certificate(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id', ondelete='CASCADE'), nullable=False)
-    certificate_id = db.Column(db.String(50), nullable=False, unique=True, index=True)
+    certificate_id = db.Column(ascii_id(50), nullable=False, unique=True, index=True)
     file_path = db.Column(db.String(255), nullable=False)
     issue_date = db.Column(db.Date, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     user = db.relationship('User', back_populates='certificates')
@@ -202,12 +255,12 @@ class Payment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id', ondelete='CASCADE'), nullable=False, index=True)
-    stripe_payment_id = db.Column(db.String(100), nullable=False, unique=True)
+    stripe_payment_id = db.Column(ascii_id(100), nullable=False, unique=True)
     amount = db.Column(db.Numeric(10, 2), nullable=False)
     status = db.Column(db.String(50), nullable=False, index=True)
     payment_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     user = db.relationship('User', back_populates='payments')
@@ -226,8 +279,8 @@ class UserCourse(db.Model):
     enrollment_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     completed = db.Column(db.Boolean, default=False)
     completion_date = db.Column(db.DateTime, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     user = db.relationship('User', back_populates='enrolled_courses')
@@ -250,7 +303,7 @@ class VideoProgress(db.Model):
     seconds_watched = db.Column(db.Integer, default=0)
     is_completed = db.Column(db.Boolean, default=False)
     last_watched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     user = db.relationship('User', back_populates='video_progress')
@@ -273,8 +326,8 @@ class CoursePDF(db.Model):
     description = db.Column(db.Text)
     pdf_path = db.Column(db.String(255), nullable=False)
     sequence_order = db.Column(db.Integer, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     course = db.relationship('Course', back_populates='pdfs')
@@ -300,18 +353,112 @@ class PlatformConfig(db.Model):
     stripe_secret_key = db.Column(db.String(255), nullable=True)
     stripe_publishable_key = db.Column(db.String(255), nullable=True)
     stripe_enabled = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=func.now())
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=datetime.utcnow)
+    
+    # Detached copy of the config row per engine, with the time it was taken;
+    # reset once a write to the row commits (see the session hooks below) and
+    # refreshed after CONFIG_CACHE_TTL seconds so other workers' edits show up.
+    # The generation lets a load that raced with a reset discard its result
+    _cached = {}
+    _cache_generation = 0
+    
+    @classmethod
+    def reset_cache(cls):
+        """Drop every cached snapshot"""
+        cls._cache_generation += 1
+        cls._cached.clear()
     
     def __repr__(self):
         return f'<PlatformConfig {self.platform_name}>'
     
     @classmethod
-    def get_config(cls):
-        """Get the current platform configuration or create default if not exists"""
-        config = cls.query.first()
+    def get_config(cls, create=True, for_update=False):
+        """Get the current platform configuration or create default if not exists
+        
+        Args:
+            create: Insert the default row when none exists; pass False for
+                read-only checks, which then get None instead.
+            for_update: Re-read the row from the database rather than the
+                cached snapshot, so changes are never flushed against a row
+                that was deleted or edited elsewhere.
+        
+        Returns:
+            PlatformConfig: The config row, or None if create is False and
+            there is no row.
+        """
+        # Reuse the instance already resolved during this request
+        if has_request_context() and not for_update:
+            config = g.get('_platform_config')
+            if config is None:
+                config = cls._load_config(create)
+                if config is not None:
+                    g._platform_config = config
+            return config
+        
+        config = cls._load_config(create, for_update)
+        if config is not None and has_request_context():
+            g._platform_config = config
+        return config
+    
+    @classmethod
+    def _load_config(cls, create, for_update=False):
+        """Resolve the config row from this engine's snapshot or the database"""
+        engine = db.engine
+        cached = cls._cached.get(engine)
+        if (not for_update and cached is not None
+                and time.monotonic() - cached[1] < current_app.config['CONFIG_CACHE_TTL']):
+            snapshot = cached[0]
+            existing = db.session.identity_map.get(db.inspect(snapshot).identity_key)
+            if existing is not None:
+                return existing
+            # Attach a copy of the cached row to this session without a SELECT
+            return db.session.merge(snapshot, load=False)
+        
+        generation = cls._cache_generation
+        
+        # populate_existing overwrites any instance this session already holds
+        # from the snapshot with what is actually in the database
+        config = cls.query.populate_existing().first()
         if not config:
-            config = cls()
-            db.session.add(config)
+            if not create:
+                return None
+            # INSERT IGNORE on a fixed id so concurrent first-boot workers can't
+            # race each other into duplicate rows or unique-key rollbacks
+            db.session.execute(
+                cls.__table__.insert().values(id=1)
+                .prefix_with('IGNORE', dialect='mysql')
+                .prefix_with('OR IGNORE', dialect='sqlite')
+            )
             db.session.commit()
-        return config
\ No newline at end of file
+            config = cls.query.populate_existing().first()
+        
+        snapshot = cls(**{column.key: getattr(config, column.key) for column in cls.__table__.columns})
+        make_transient_to_detached(snapshot)
+        # Skip storing a row read before a concurrent commit reset the cache
+        if generation == cls._cache_generation:
+            cls._cached[engine] = (snapshot, time.monotonic())
+        return config
+
+@event.listens_for(PlatformConfig, 'after_insert')
+@event.listens_for(PlatformConfig, 'after_update')
+@event.listens_for(PlatformConfig, 'after_delete')
+def mark_platform_config_changed(mapper, connection, target):
+    """Flag the session so the cache is dropped once the write is committed"""
+    session = object_session(target)
+    if session is not None:
+        session.info['platform_config_changed'] = True
+
+@event.listens_for(Session, 'after_commit')
+def reset_platform_config_cache(session):
+    """Drop the cached config after a committed write, not at flush time, so
+    other threads can't re-cache the old row before the commit lands"""
+    if session.info.pop('platform_config_changed', False):
+        PlatformConfig.reset_cache()
+
+@event.listens_for(Session, 'after_soft_rollback')
+def reset_platform_config_cache_on_rollback(session, previous_transaction):
+    """Drop the cached config after a failed flush, e.g. a StaleDataError
+    from a row deleted outside this process, so the next read reloads it"""
+    session.info.pop('platform_config_changed', None)
+    PlatformConfig.reset_cache()
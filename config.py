@@ -48,6 +48,19 @@ class Config:
     SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool settings - recycle connections before the remote server's
+    # wait_timeout drops them and ping on checkout so a stale one is replaced
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_recycle': 280,
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        # Pin the session clock to UTC so server-side CURRENT_TIMESTAMP defaults
+        # agree with the datetime.utcnow values the models write from Python
+        'connect_args': {'init_command': "SET time_zone = '+00:00'"}
+    }
+    
     # Flask-Mail settings - Hardcoded mail settings
     MAIL_SERVER = 'smtp.gmail.com'
     MAIL_PORT = 587
@@ -66,6 +79,13 @@ class Config:
     
     # Setup flag file path
     SETUP_FLAG_FILE = os.path.join(basedir, '.setup_done')
+    
+    # Seconds a worker reuses its cached PlatformConfig row before re-reading it
+    CONFIG_CACHE_TTL = int(os.environ.get('CONFIG_CACHE_TTL', 30))
+    
+    @classmethod
+    def init_app(cls, app):
+        pass
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -81,8 +101,7 @@ class ProductionConfig(Config):
         import logging
         from logging.handlers import RotatingFileHandler
         
-        if not os.path.exists('logs'):
-            os.mkdir('logs')
+        os.makedirs('logs', exist_ok=True)
         
         file_handler = RotatingFileHandler('logs/modular_course.log',
                                           maxBytes=10240, backupCount=10)
@@ -92,11 +111,22 @@ class ProductionConfig(Config):
         app.logger.addHandler(file_handler)
         app.logger.setLevel(logging.INFO)
         app.logger.info('Modular Course Platform startup')
+        
+        # Persist compiled template bytecode so restarts and new workers skip
+        # re-compiling every Jinja template
+        from jinja2 import FileSystemBytecodeCache
+        
+        jinja_cache_dir = os.path.join(basedir, '.jinja_cache')
+        os.makedirs(jinja_cache_dir, exist_ok=True)
+        
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=jinja_cache_dir,
+                                                               pattern='%s.cache')
 
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
     WTF_CSRF_ENABLED = False
 
 # Dictionary mapping environment names to configuration classes
@@ -4,6 +4,7 @@
 -- Drop existing tables if they exist
 SET FOREIGN_KEY_CHECKS = 0;
 DROP TABLE IF EXISTS users;
+DROP TABLE IF EXISTS user_credentials;
 DROP TABLE IF EXISTS courses;
 DROP TABLE IF EXISTS videos;
 DROP TABLE IF EXISTS quizzes;
@@ -20,13 +21,21 @@ CREATE TABLE users (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
     email VARCHAR(100) NOT NULL UNIQUE,
-    password_hash VARCHAR(255) NOT NULL,
     is_admin BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX (email)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- User Credentials Table (1:1 with users, kept out of the hot users row)
+CREATE TABLE user_credentials (
+    user_id INT PRIMARY KEY,
+    password_hash VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 -- Courses Table
 CREATE TABLE courses (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -99,7 +108,7 @@ CREATE TABLE quiz_attempts (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (quiz_id) REFERENCES quizzes(id) ON DELETE CASCADE,
-    INDEX (user_id),
+    INDEX idx_quiz_attempts_user_completed (user_id, completed_at),
     INDEX (quiz_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
@@ -108,15 +117,14 @@ CREATE TABLE certificates (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL,
     course_id INT NOT NULL,
-    certificate_id VARCHAR(50) NOT NULL UNIQUE,
+    certificate_id VARCHAR(50) CHARACTER SET ascii COLLATE ascii_bin NOT NULL UNIQUE,
     file_path VARCHAR(255) NOT NULL,
     issue_date DATE NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
-    UNIQUE KEY (user_id, course_id),
-    INDEX (certificate_id)
+    UNIQUE KEY (user_id, course_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- Payments Table
@@ -124,7 +132,7 @@ CREATE TABLE payments (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL,
     course_id INT NOT NULL,
-    stripe_payment_id VARCHAR(100) NOT NULL UNIQUE,
+    stripe_payment_id VARCHAR(100) CHARACTER SET ascii COLLATE ascii_bin NOT NULL UNIQUE,
     amount DECIMAL(10, 2) NOT NULL,
     status VARCHAR(50) NOT NULL,
     payment_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -3,35 +3,57 @@ Database initialization script for Modular Course Platform
 
 This script creates all database tables defined in the ORM models
 """
-from app import create_app, db
+from sqlalchemy import inspect, select
+from app import db
 from app.models import User, Course, Video, Quiz, PlatformConfig
+from setup_common import get_app
 
-# Main initialization
-if __name__ == "__main__":
-    # Create Flask app instance
-    app = create_app()
+def initialize_database():
+    """Create all tables and the default platform configuration"""
+    app = get_app()
     print("Attempting to connect to remote database...")
     
     with app.app_context():
         try:
-            # Create all tables
-            db.create_all()
-            print("Database tables created successfully.")
-            
-            # Check if a PlatformConfig entry exists, create one if not
-            platform_config = PlatformConfig.query.first()
-            if not platform_config:
-                platform_config = PlatformConfig(
-                    platform_name="Modular Course Platform",
-                    primary_color="#0d6efd",
-                    secondary_color="#6c757d",
-                    setup_complete=False
-                )
-                db.session.add(platform_config)
-                db.session.commit()
-                print("Default platform configuration created.")
+            # Create the tables and seed the default config on one connection
+            with db.engine.begin() as connection:
+                # One table listing instead of create_all's per-table existence probe
+                existing_tables = set(inspect(connection).get_table_names())
+                missing_tables = [table for table in db.metadata.sorted_tables
+                                  if table.name not in existing_tables]
+                if missing_tables:
+                    db.metadata.create_all(connection, tables=missing_tables, checkfirst=False)
+                    print("Database tables created successfully.")
+                else:
+                    print("Database tables already exist.")
+                
+                # Seed only when there is no config row at all, whatever its id,
+                # mirroring get_config; INSERT IGNORE on id 1 covers two
+                # initializers racing past the check
+                config_exists = connection.execute(
+                    select(PlatformConfig.__table__.c.id).limit(1)
+                ).first() is not None
+                
+                if not config_exists:
+                    connection.execute(
+                        PlatformConfig.__table__.insert()
+                        .values(id=1,
+                                platform_name="Modular Course Platform",
+                                primary_color="#0d6efd",
+                                secondary_color="#6c757d",
+                                setup_complete=False)
+                        .prefix_with('IGNORE', dialect='mysql')
+                        .prefix_with('OR IGNORE', dialect='sqlite')
+                    )
+                    print("Default platform configuration created.")
             
             print("Database initialization complete.")
+            return True
         except Exception as e:
             print(f"Error initializing database: {str(e)}")
-            print("Please ensure your database credentials are correct and the database exists.")
\ No newline at end of file
+            print("Please ensure your database credentials are correct and the database exists.")
+            return False
+
+# Main initialization
+if __name__ == "__main__":
+    initialize_database()
@@ -0,0 +1,59 @@
+"""
+Migration script to move users.password_hash into the user_credentials table
+"""
+import os
+import sys
+from sqlalchemy import text
+from sqlalchemy.schema import CreateTable
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import after adding to path
+from app import db
+from setup_common import get_app
+from app.models import UserCredential
+
+# Reuse the app shared across setup scripts
+app = get_app()
+
+# Statements are built once at import rather than on every run
+CHECK_COLUMN = text("SHOW COLUMNS FROM users LIKE 'password_hash'")
+CREATE_CREDENTIALS_TABLE = CreateTable(UserCredential.__table__, if_not_exists=True)
+# Skips users already copied, so a run that failed after the copy committed
+# (the DROP below commits it implicitly) can simply be rerun
+COPY_PASSWORD_HASHES = text(
+    "INSERT INTO user_credentials (user_id, password_hash, created_at, updated_at) "
+    "SELECT id, password_hash, created_at, updated_at FROM users "
+    "WHERE NOT EXISTS (SELECT 1 FROM user_credentials uc WHERE uc.user_id = users.id)"
+)
+DROP_COLUMN = text("ALTER TABLE users DROP COLUMN password_hash")
+
+def move_password_hash_column():
+    """Copy password hashes into user_credentials and drop the old users column"""
+    with app.app_context():
+        try:
+            # Scope the connection to this block. The DROP commits the copy before it
+            # implicitly, so nothing here can be rolled back; each step is rerunnable
+            with db.engine.begin() as connection:
+                # Check if the old column is still present to avoid errors
+                result = connection.execute(CHECK_COLUMN)
+                column_exists = result.fetchone() is not None
+
+                if column_exists:
+                    # IF NOT EXISTS replaces checkfirst's separate table lookup
+                    connection.execute(CREATE_CREDENTIALS_TABLE)
+
+                    connection.execute(COPY_PASSWORD_HASHES)
+                    connection.execute(DROP_COLUMN)
+                    print("Successfully moved password_hash into user_credentials table")
+                else:
+                    print("Column password_hash has already been moved out of users table")
+
+            return True
+        except Exception as e:
+            print(f"Error moving column: {str(e)}")
+            return False
+
+if __name__ == "__main__":
+    move_password_hash_column()
@@ -1,12 +1,16 @@
-from app import create_app, db
+from sqlalchemy import update
+from app import db
 from app.models import PlatformConfig
+from setup_common import get_app
 
-app = create_app()
-
-with app.app_context():
-    # Reset or create platform config
-    config = PlatformConfig.query.first()
-    if config:
-        config.setup_complete = False
+def reset_setup():
+    """Mark the setup wizard as not yet completed"""
+    with get_app().app_context():
+        # Reset platform config in a single UPDATE
+        result = db.session.execute(update(PlatformConfig).values(setup_complete=False))
         db.session.commit()
-        print("Setup status reset successfully!")
\ No newline at end of file
+        if result.rowcount:
+            print("Setup status reset successfully!")
+
+if __name__ == "__main__":
+    reset_setup()
@@ -1,27 +1,53 @@
 """
 Modular Course Platform - Application Entry Point
 """
+import os
 import sys
 import time
 import argparse
-from flask import cli
-from app import create_app
-from test_db_connection import test_database_connection
+import itertools
 from config import Config
 
-# Disable Flask's messages about running a development server
-cli.show_server_banner = lambda *args: None
+def _backoff(initial=0.2, factor=2.5, maximum=5.0):
+    """Yield exponentially growing retry delays, capped at maximum seconds"""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+def wait_for_database(app, attempts=6):
+    """Ping the database through the app's engine, backing off between failures"""
+    from app import db
+    
+    delays = itertools.islice(_backoff(), attempts - 1)
+    for attempt in range(attempts):
+        try:
+            # Checking a connection out of the pool establishes it once and
+            # leaves it pooled for the first request to reuse
+            with app.app_context():
+                db.engine.connect().close()
+            return True
+        except Exception as e:
+            print(f"Database not reachable (attempt {attempt+1}/{attempts}): {str(e)}")
+            delay = next(delays, None)
+            if delay is None:
+                return False
+            time.sleep(delay)
 
 def reset_course_data():
     """Reset all course completion data in the database."""
     from app import db
-    from app.models import User, Course, CourseProgress  # Import your actual models
+    from app.models import UserCourse, VideoProgress
     
     try:
         print("Resetting course completion data...")
-        # This implementation depends on your actual data model
-        # The following is a generic approach - modify according to your schema
-        db.session.query(CourseProgress).delete()
+        # Bulk statements with synchronize_session=False skip loading every
+        # affected row into the session just to expire it
+        db.session.query(VideoProgress).delete(synchronize_session=False)
+        db.session.query(UserCourse).update(
+            {UserCourse.completed: False, UserCourse.completion_date: None},
+            synchronize_session=False
+        )
         db.session.commit()
         print("[SUCCESS] Course completion data has been reset.")
     except Exception as e:
@@ -36,29 +62,26 @@ if __name__ == "__main__":
     parser.add_argument('--reset', action='store_true', help='Reset all course completion data')
     args = parser.parse_args()
     
+    # Flask and the app package are imported only after argument parsing so
+    # --help and bad arguments return without loading the whole stack
+    from flask import cli
+    from app import create_app
+    
+    # Disable Flask's messages about running a development server
+    cli.show_server_banner = lambda *args: None
+    
+    # Create the Flask application
+    app = create_app()
+    
     # Test database connection before starting the server
     print("Testing database connection...")
     
-    # Try to connect up to 3 times with 2 second delay between attempts
-    connected = False
-    for attempt in range(3):
-        if attempt > 0:
-            print(f"Retrying connection (attempt {attempt+1}/3)...")
-            time.sleep(2)
-        
-        if test_database_connection():
-            connected = True
-            break
-    
-    if not connected:
+    if not wait_for_database(app):
         print(f"[ERROR] Failed to connect to database at {Config.DB_HOST}:{Config.DB_PORT}")
         print("Please check your database settings in config.py")
         print("Exiting...")
         sys.exit(1)
     
-    # Create the Flask application
-    app = create_app()
-    
     # Reset course data if requested
     if args.reset:
         with app.app_context():
@@ -66,4 +89,9 @@ if __name__ == "__main__":
                 sys.exit(1)
     
     print(f"[SUCCESS] Starting Flask server with database at {Config.DB_HOST}")
-    app.run(debug=True)
\ No newline at end of file
+    # debug=None leaves the reloader and debugger to Flask's own FLASK_DEBUG
+    # handling, which runs after .env is loaded; threaded lets requests waiting
+    # on the remote database overlap instead of queueing behind each other
+    app.run(debug=None,
+            threaded=True,
+            host=os.getenv('HOST', '127.0.0.1'))
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Run every setup and migration step against one shared app and engine
+"""
+from setup_common import get_app
+from add_image_url_column import add_image_url_column
+from add_quiz_attempt_index import add_quiz_attempt_index
+from add_timestamp_defaults import add_timestamp_defaults
+from alter_id_collations import alter_id_collations
+from move_password_hash_column import move_password_hash_column
+from initialize_db import initialize_database
+
+# Steps in the order they must be applied; each returns True on success.
+# Creating the tables first lets the migrations below no-op on a fresh database.
+# The migrations ALTER tables linked by foreign keys to users, so they run one
+# at a time rather than competing for metadata locks
+SETUP_STEPS = [
+    initialize_database,
+    add_image_url_column,
+    alter_id_collations,
+    move_password_hash_column,
+    add_quiz_attempt_index,
+    add_timestamp_defaults,
+]
+
+def run_all_setup():
+    """Apply each setup step in order, stopping at the first failure"""
+    with get_app().app_context():
+        for step in SETUP_STEPS:
+            if not step():
+                print(f"Setup stopped: {step.__name__} failed")
+                return False
+    
+    print("All setup steps completed.")
+    return True
+
+if __name__ == "__main__":
+    run_all_setup()
@@ -0,0 +1,17 @@
+"""
+Shared helpers for the standalone setup and migration scripts
+"""
+import functools
+import os
+import sys
+
+# Add the project directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+@functools.lru_cache(maxsize=1)
+def get_app():
+    """Return the Flask app shared by every setup script in this process"""
+    # Import after adding to path, and only once an app is actually needed
+    from app import create_app
+    
+    return create_app()
@@ -4,41 +4,48 @@ Database connection tester for Modular Course Platform
 This script tests the connection to the MariaDB database server
 and verifies that the database exists and is accessible.
 """
-import pymysql
 import sys
 from config import Config
 
 def test_database_connection():
     """Test the connection to the MariaDB database"""
+    # Imported here so loading this module stays cheap until a test actually runs
+    import pymysql
+    from pymysql.constants import ER
+    
     print(f"Testing connection to {Config.DB_HOST}:{Config.DB_PORT}...")
     
     try:
-        # Connect to MariaDB with the credentials from Config
+        # Connect straight into the target database; the server rejects the
+        # handshake with ER_BAD_DB_ERROR if it doesn't exist, so no separate
+        # existence query or USE statement is needed
         connection = pymysql.connect(
             host=Config.DB_HOST,
             port=Config.DB_PORT,
             user=Config.DB_USER,
             password=Config.DB_PASSWORD,
-            charset='utf8mb4'
+            database=Config.DB_NAME,
+            charset='utf8mb4',
+            # Don't leave the probe statements in an open transaction holding locks
+            autocommit=True
         )
-        
-        print("[SUCCESS] Successfully connected to database server!")
-        
+    except pymysql.err.OperationalError as e:
+        if e.args[0] == ER.BAD_DB_ERROR:
+            print("[SUCCESS] Successfully connected to database server!")
+            print(f"[ERROR] Database '{Config.DB_NAME}' doesn't exist.")
+        else:
+            print(f"[ERROR] Error connecting to database: {str(e)}")
+        return False
+    except Exception as e:
+        print(f"[ERROR] Error connecting to database: {str(e)}")
+        return False
+    
+    print("[SUCCESS] Successfully connected to database server!")
+    print(f"[SUCCESS] Database '{Config.DB_NAME}' exists.")
+    print(f"[SUCCESS] Successfully accessed database '{Config.DB_NAME}'.")
+    
+    with connection:
         with connection.cursor() as cursor:
-            # Check if database exists
-            cursor.execute(f"SHOW DATABASES LIKE '{Config.DB_NAME}';")
-            result = cursor.fetchone()
-            
-            if not result:
-                print(f"[ERROR] Database '{Config.DB_NAME}' doesn't exist.")
-                return False
-            else:
-                print(f"[SUCCESS] Database '{Config.DB_NAME}' exists.")
-                
-            # Try to use the database
-            cursor.execute(f"USE {Config.DB_NAME};")
-            print(f"[SUCCESS] Successfully accessed database '{Config.DB_NAME}'.")
-            
             # Check if we can create and drop a test table
             try:
                 cursor.execute("CREATE TABLE test_connection (id INT);")
@@ -47,12 +54,8 @@ def test_database_connection():
             except Exception as e:
                 print(f"[ERROR] Could not create/drop table: {str(e)}")
                 return False
-        
-        connection.close()
-        return True
-    except Exception as e:
-        print(f"[ERROR] Error connecting to database: {str(e)}")
-        return False
+    
+    return True
 
 if __name__ == "__main__":
     print("==========================================")